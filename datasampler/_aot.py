@@ -0,0 +1,21 @@
+"""
+Ahead-of-time compilation of the sampling kernels.
+
+Building this module produces the native extension datasampler._sampler_native,
+which the sampler imports in place of the JIT kernel so that no compilation
+happens at runtime. Compile it in place with:
+
+    python -m datasampler._aot
+"""
+from numba.pycc import CC
+from ._kernels import _sample_single_type_kernel, _sample_fused_kernel
+
+cc = CC('_sampler_native')
+
+cc.export('sample_single_type_kernel',
+          'Tuple((i8[:], f8[:]))(i8[:], f8[:], i8)')(_sample_single_type_kernel)
+cc.export('sample_fused_kernel',
+          'Tuple((i8[:], i1[:], f8[:]))(i8[:], i1[:], f8[:], i8)')(_sample_fused_kernel)
+
+if __name__ == '__main__':
+    cc.compile()
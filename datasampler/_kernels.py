@@ -0,0 +1,110 @@
+"""
+Compiled kernels for the sampling pipeline.
+
+The kernels are taken from the ahead-of-time compiled extension built by
+datasampler._aot when it is present, and JIT compiled with Numba otherwise.
+Numba is an optional dependency; when neither is available HAS_KERNEL is
+False and the sampler falls back to its NumPy implementation.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+HAS_NUMBA: bool = njit is not None
+
+
+def _sample_single_type_kernel(times_us, values, interval_us):
+    """
+    Samples the sorted measurements of a single type in one pass, keeping the
+    last measurement of each interval.
+
+    Args:
+        times_us (np.ndarray): The sorted, non-empty measurement times as int64 microseconds.
+        values (np.ndarray): The float64 measurement values.
+        interval_us (int): The sampling interval in microseconds.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The sample times and values.
+    """
+    n = times_us.shape[0]
+    out_times = np.empty(n, np.int64)
+    out_values = np.empty(n, np.float64)
+    k = 0
+    current_end = -(-times_us[0] // interval_us) * interval_us
+
+    for i in range(1, n):
+        time = times_us[i]
+        if time > current_end:
+            out_times[k] = current_end
+            out_values[k] = values[i - 1]
+            k += 1
+            current_end = -(-time // interval_us) * interval_us
+
+    out_times[k] = current_end
+    out_values[k] = values[n - 1]
+    k += 1
+
+    return out_times[:k], out_values[:k]
+
+
+def _sample_fused_kernel(times_us, types, values, interval_us):
+    """
+    Samples the sorted measurements of every type in one pass, keeping the
+    last measurement of each interval per type.
+
+    Args:
+        times_us (np.ndarray): The sorted, non-empty measurement times as int64 microseconds.
+        types (np.ndarray): The int8 MeasType codes.
+        values (np.ndarray): The float64 measurement values.
+        interval_us (int): The sampling interval in microseconds.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The sample times, type codes
+            and values, in the order the samples were completed.
+    """
+    n = times_us.shape[0]
+    out_times = np.empty(n, np.int64)
+    out_types = np.empty(n, np.int8)
+    out_values = np.empty(n, np.float64)
+    n_codes = int(types.max()) + 1
+    seen = np.zeros(n_codes, np.bool_)
+    current_end = np.zeros(n_codes, np.int64)
+    current_value = np.zeros(n_codes, np.float64)
+    k = 0
+
+    for i in range(n):
+        code = types[i]
+        end = -(-times_us[i] // interval_us) * interval_us
+        if seen[code] and end != current_end[code]:
+            out_times[k] = current_end[code]
+            out_types[k] = code
+            out_values[k] = current_value[code]
+            k += 1
+        seen[code] = True
+        current_end[code] = end
+        current_value[code] = values[i]
+
+    for code in range(n_codes):
+        if seen[code]:
+            out_times[k] = current_end[code]
+            out_types[k] = code
+            out_values[k] = current_value[code]
+            k += 1
+
+    return out_times[:k], out_types[:k], out_values[:k]
+
+
+try:
+    from ._sampler_native import sample_single_type_kernel, sample_fused_kernel
+except ImportError:
+    if HAS_NUMBA:
+        sample_single_type_kernel = njit(cache=True, nogil=True)(_sample_single_type_kernel)
+        sample_fused_kernel = njit(cache=True, nogil=True)(_sample_fused_kernel)
+    else:
+        sample_single_type_kernel = None
+        sample_fused_kernel = None
+
+HAS_KERNEL: bool = sample_single_type_kernel is not None
@@ -1,6 +1,9 @@
+from collections.abc import Sequence
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, tzinfo
 from enum import Enum
+from typing import Iterable, NamedTuple, Optional
+import numpy as np
 
 
 class MeasType(Enum):
@@ -9,10 +12,21 @@ class MeasType(Enum):
     HR = 2
     TEMP = 3
 
-@dataclass
+# MeasType -> value table, a plain dict lookup is cheaper than the .value property
+_TYPE_CODES = {meas_type: meas_type.value for meas_type in MeasType}
+# value -> MeasType table, the inverse lookup used when rebuilding Measurements from codes
+_CODE_TYPES = {code: meas_type for meas_type, code in _TYPE_CODES.items()}
+# MeasType -> name table, avoids the enum .name property when printing
+_TYPE_NAMES = {meas_type: meas_type.name for meas_type in MeasType}
+
+@dataclass(slots=True, frozen=True)
 class Measurement:
     """
-    Represents a single measurement.
+    Represents a single, immutable measurement.
+
+    The measurement time is stored as given. DataSampler ignores the
+    microsecond when sampling, and the measurements it returns always
+    have a microsecond of 0.
 
     Attributes:
         measurement_time (datetime): The time of measurement.
@@ -23,11 +37,22 @@ class Measurement:
     measurement_type: MeasType = MeasType.SPO2
     value: float = 0.0
 
-    def __post_init__(self):
+    @classmethod
+    def truncated(cls, measurement_time: datetime,
+                  measurement_type: MeasType = MeasType.SPO2,
+                  value: float = 0.0) -> "Measurement":
         """
-        Removes the microsecond from the measurement
+        Creates a measurement with the microsecond removed from its time.
+
+        Args:
+            measurement_time (datetime): The time of measurement.
+            measurement_type (MeasType): The type of measurement (SPO2, HR, TEMP).
+            value (float): The numeric value of the measurement.
+
+        Returns:
+            Measurement: A measurement whose time has a microsecond of 0.
         """
-        self.measurement_time = self.measurement_time.replace(microsecond=0)
+        return cls(measurement_time.replace(microsecond=0), measurement_type, value)
 
     def __str__(self):
         """
@@ -37,5 +62,67 @@ class Measurement:
             str: A string in the format "{measurement_time, measurement_type, value}
         """
         return f"{self.measurement_time.isoformat()}, {self.measurement_type.name}, {self.value:.2f}"
-    
-    
\ No newline at end of file
+
+
+class MeasurementArrays(NamedTuple):
+    """
+    Column (structure of arrays) representation of a list of measurements.
+
+    Attributes:
+        times_us (np.ndarray): The measurement times as int64 microseconds since the epoch.
+        types (np.ndarray): The MeasType values of the measurements as int8.
+        values (np.ndarray): The numeric values of the measurements as float64.
+        time_zone (tzinfo, optional): The timezone of timezone-aware measurement times,
+            None for naive ones. Aware times are stored as wall-clock time in this zone.
+    """
+    times_us: np.ndarray
+    types: np.ndarray
+    values: np.ndarray
+    time_zone: Optional[tzinfo] = None
+
+    @classmethod
+    def from_measurements(cls, measurements: Iterable[Measurement]) -> "MeasurementArrays":
+        """
+        Converts measurements into columns.
+
+        Args:
+            measurements (Iterable[Measurement]): The Measurement objects, as a sequence
+                or any other iterable, which is read into a list once.
+
+        Returns:
+            MeasurementArrays: One column entry per measurement.
+
+        Raises:
+            TypeError: If naive and timezone-aware measurement times are mixed.
+        """
+        if not isinstance(measurements, Sequence):
+            measurements = list(measurements)
+        count = len(measurements)
+        times = [m.measurement_time for m in measurements]
+        time_zone = None
+        tzinfos = {time.tzinfo for time in times}
+        if tzinfos - {None}:
+            if None in tzinfos:
+                raise TypeError("Measurement times must be either all naive or all timezone-aware")
+            # Aware times are sampled on the wall clock of the first measurement's timezone.
+            time_zone = times[0].tzinfo
+            times = [time.astimezone(time_zone).replace(tzinfo=None) for time in times]
+        times_us = np.array(times, dtype='datetime64[us]').view(np.int64)
+        types = np.fromiter((_TYPE_CODES[m.measurement_type] for m in measurements),
+                            dtype=np.int8, count=count)
+        values = np.fromiter((m.value for m in measurements),
+                             dtype=np.float64, count=count)
+        return cls(times_us, types, values, time_zone)
+
+    def take(self, index) -> "MeasurementArrays":
+        """
+        Selects entries from every column.
+
+        Args:
+            index: An integer index array, boolean mask or slice.
+
+        Returns:
+            MeasurementArrays: The selected entries.
+        """
+        return MeasurementArrays(self.times_us[index], self.types[index], self.values[index],
+                                 self.time_zone)
@@ -22,7 +22,7 @@ def generate_measurements(num_measurements: int) -> List[Measurement]:
         measurement_time = start_time + timedelta(seconds=random.randint(0, 3600))
         measurement_type = random.choice(measurement_types)
         value = round(random.uniform(90.0, 100.0) if measurement_type == MeasType.SPO2 else random.uniform(30.0, 40.0), 2)
-        measurement = Measurement(measurement_time, measurement_type, value)
+        measurement = Measurement.truncated(measurement_time, measurement_type, value)
         measurements.append(measurement)
 
     return measurements
@@ -1,13 +1,28 @@
 from setuptools import setup, find_packages
 
+# Build the ahead-of-time compiled sampling kernel when Numba is available at
+# install time; without it the sampler JIT compiles or uses NumPy instead.
+try:
+    from datasampler._aot import cc
+    ext_modules = [cc.distutils_extension()]
+except ImportError:
+    ext_modules = []
+
 setup(
     name="data-sampler",
     version="1.1",
     author="tejas chendekar",
     author_email="tejaschendekar2@gmail.com",
     packages=find_packages(),
+    ext_modules=ext_modules,
+    install_requires=[
+        "numpy>=1.20",
+    ],
+    extras_require={
+        "numba": ["numba>=0.55"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.10',
 )
\ No newline at end of file
@@ -0,0 +1,10 @@
+"""Shared helpers for the unit tests."""
+from datetime import datetime
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def dt(*args: int) -> datetime:
+    """Returns datetime(*args), reusing the object for repeated arguments"""
+    return datetime(*args)
+
@@ -0,0 +1,66 @@
+import unittest
+from dataclasses import FrozenInstanceError
+from datetime import datetime, timedelta, timezone
+from datasampler.measurement import Measurement, MeasType, MeasurementArrays
+
+class TestMeasurement(unittest.TestCase):
+    """Unit tests for the Measurement class."""
+
+    def test_measurement_time_kept(self):
+        """Test the measurement time is stored as given"""
+
+        measurement = Measurement(datetime(2024, 1, 1, 10, 1, 30, 999), MeasType.TEMP, 36.0)
+        self.assertEqual(measurement.measurement_time, datetime(2024, 1, 1, 10, 1, 30, 999))
+
+    def test_truncated(self):
+        """Test the truncated constructor removes the microsecond"""
+
+        measurement = Measurement.truncated(datetime(2024, 1, 1, 10, 1, 30, 999), MeasType.TEMP, 36.0)
+        self.assertEqual(measurement, Measurement(datetime(2024, 1, 1, 10, 1, 30), MeasType.TEMP, 36.0))
+
+    def test_immutable(self):
+        """Test measurements cannot be modified after creation"""
+
+        measurement = Measurement(datetime(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0)
+        with self.assertRaises(FrozenInstanceError):
+            measurement.value = 37.0
+
+    def test_equality_and_hash(self):
+        """Test measurements compare and hash by their fields"""
+
+        measurement = Measurement(datetime(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0)
+        same = Measurement(datetime(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0)
+        self.assertEqual(measurement, same)
+        self.assertEqual(hash(measurement), hash(same))
+        self.assertNotEqual(measurement, Measurement(datetime(2024, 1, 1, 10, 1), MeasType.HR, 36.0))
+
+    def test_measurement_arrays(self):
+        """Test conversion of measurements into column arrays"""
+
+        measurements = [
+            Measurement(datetime(1970, 1, 1, 0, 0, 1), MeasType.TEMP, 36.0),
+            Measurement(datetime(1970, 1, 1, 0, 1), MeasType.HR, 70),
+        ]
+        columns = MeasurementArrays.from_measurements(measurements)
+        self.assertEqual(columns.times_us.tolist(), [1_000_000, 60_000_000])
+        self.assertEqual(columns.types.tolist(), [MeasType.TEMP.value, MeasType.HR.value])
+        self.assertEqual(columns.values.tolist(), [36.0, 70.0])
+        self.assertEqual(columns.take([1]).types.tolist(), [MeasType.HR.value])
+        self.assertIsNone(columns.time_zone)
+
+    def test_measurement_arrays_timezone_aware(self):
+        """Test aware times are stored as wall-clock time in the first measurement's timezone"""
+
+        utc_plus_2 = timezone(timedelta(hours=2))
+        measurements = [
+            Measurement(datetime(1970, 1, 1, 2, 0, 1, tzinfo=utc_plus_2), MeasType.TEMP, 36.0),
+            Measurement(datetime(1970, 1, 1, 0, 1, tzinfo=timezone.utc), MeasType.HR, 70),
+        ]
+        columns = MeasurementArrays.from_measurements(measurements)
+        self.assertEqual(columns.times_us.tolist(), [7_201_000_000, 7_260_000_000])
+        self.assertEqual(columns.time_zone, utc_plus_2)
+        self.assertEqual(columns.take([1]).time_zone, utc_plus_2)
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestMeasurement)
+    unittest.TextTestRunner(verbosity=2).run(suite)
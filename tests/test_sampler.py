@@ -1,58 +1,187 @@
 import unittest
 import io
-import sys
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from datetime import timedelta, timezone
+from unittest import mock
+import numpy as np
+from datasampler import _kernels
 from datasampler.measurement import Measurement, MeasType
 from datasampler.sampler import DataSampler
+from .helpers import dt
+
+# The example from the README
+_GIVEN_MEASUREMENTS = (
+    Measurement(dt(2017, 1, 3, 10, 4, 45), MeasType.TEMP, 35.79),
+    Measurement(dt(2017, 1, 3, 10, 1, 18), MeasType.SPO2, 98.78),
+    Measurement(dt(2017, 1, 3, 10, 9, 7), MeasType.TEMP, 35.01),
+    Measurement(dt(2017, 1, 3, 10, 3, 34), MeasType.SPO2, 96.49),
+    Measurement(dt(2017, 1, 3, 10, 2, 1), MeasType.TEMP, 35.82),
+    Measurement(dt(2017, 1, 3, 10, 5), MeasType.SPO2, 97.17),
+    Measurement(dt(2017, 1, 3, 10, 5, 1), MeasType.SPO2, 95.08),
+)
+
+_GIVEN_SAMPLES = (
+    Measurement(dt(2017, 1, 3, 10, 5), MeasType.SPO2, 97.17),
+    Measurement(dt(2017, 1, 3, 10, 5), MeasType.TEMP, 35.79),
+    Measurement(dt(2017, 1, 3, 10, 10), MeasType.SPO2, 95.08),
+    Measurement(dt(2017, 1, 3, 10, 10), MeasType.TEMP, 35.01),
+)
+
+# Inputs of the sampling tests. The sampler must not modify them.
+_SIMPLE_INPUT = (
+    Measurement(dt(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
+    Measurement(dt(2024, 1, 1, 10, 2), MeasType.SPO2, 98.0),
+    Measurement(dt(2024, 1, 1, 10, 3), MeasType.TEMP, 36.5),
+    Measurement(dt(2024, 1, 1, 10, 7), MeasType.TEMP, 37.0),
+    Measurement(dt(2024, 1, 1, 10, 8), MeasType.SPO2, 99.0),
+)
+
+_TEMP_SERIES_INPUT = (
+    Measurement(dt(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
+    Measurement(dt(2024, 1, 1, 10, 3), MeasType.TEMP, 36.5),
+    Measurement(dt(2024, 1, 1, 10, 7), MeasType.TEMP, 37.0),
+)
+
+_UNSORTED_INPUT = (
+    Measurement(dt(2024, 1, 1, 10, 7), MeasType.TEMP, 37.0),
+    Measurement(dt(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
+    Measurement(dt(2024, 1, 1, 10, 3), MeasType.TEMP, 36.5),
+)
+
+_SINGLE_INPUT = (
+    Measurement(dt(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
+)
+
+_SAME_INTERVAL_INPUT = (
+    Measurement(dt(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
+    Measurement(dt(2024, 1, 1, 10, 2), MeasType.TEMP, 36.5),
+    Measurement(dt(2024, 1, 1, 10, 3), MeasType.TEMP, 37.0),
+)
+
+_EXACT_TIME_INPUT = (
+    Measurement(dt(2024, 1, 1, 10, 10), MeasType.TEMP, 36.0),
+    Measurement(dt(2024, 1, 1, 10, 10), MeasType.SPO2, 36.5),
+)
+
+_BEFORE_BOUNDARY_INPUT = (
+    Measurement(dt(2024, 1, 1, 10, 2), MeasType.TEMP, 36.0),
+    Measurement(dt(2024, 1, 1, 10, 10), MeasType.TEMP, 36.5),
+    Measurement(dt(2024, 1, 1, 10, 10), MeasType.TEMP, 36.7),
+)
+
+_BOUNDARY_INPUT = (
+    Measurement(dt(2024, 1, 1, 10, 7), MeasType.TEMP, 36.0),
+    Measurement(dt(2024, 1, 1, 10, 10), MeasType.TEMP, 36.1),
+    Measurement(dt(2024, 1, 1, 10, 10), MeasType.SPO2, 36.5),
+    Measurement(dt(2024, 1, 1, 10, 10), MeasType.HR, 36.5),
+    Measurement(dt(2024, 1, 1, 10, 15), MeasType.HR, 36.7),
+    Measurement(dt(2024, 1, 1, 10, 25), MeasType.HR, 30.5),
+)
+
+_MICROSECOND_INPUT = (
+    Measurement(dt(2024, 1, 1, 10, 9, 59, 999999), MeasType.TEMP, 36.0),
+    Measurement(dt(2024, 1, 1, 10, 10, 0, 500000), MeasType.TEMP, 36.5),
+)
+
+_LARGE_GAP_INPUT = (
+    Measurement(dt(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
+    Measurement(dt(2024, 1, 1, 11, 1), MeasType.TEMP, 36.5),
+)
+
+_MULTIPLE_TYPES_INPUT = (
+    Measurement(dt(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
+    Measurement(dt(2024, 1, 1, 10, 2), MeasType.SPO2, 98.0),
+    Measurement(dt(2024, 1, 1, 10, 3), MeasType.HR, 70),
+    Measurement(dt(2024, 1, 1, 10, 7), MeasType.TEMP, 36.5),
+)
+
+_ON_BOUNDARIES_INPUT = (
+    Measurement(dt(2024, 1, 1, 10, 0), MeasType.TEMP, 36.0),
+    Measurement(dt(2024, 1, 1, 10, 5), MeasType.TEMP, 36.5),
+    Measurement(dt(2024, 1, 1, 10, 10), MeasType.HR, 37.0),
+)
+
+_RAPID_INPUT = (
+    Measurement(dt(2024, 1, 1, 10, 1, 1), MeasType.TEMP, 36.0),
+    Measurement(dt(2024, 1, 1, 10, 1, 2), MeasType.TEMP, 36.1),
+    Measurement(dt(2024, 1, 1, 10, 1, 3), MeasType.TEMP, 36.2),
+)
+
+_SPARSE_INPUT = (
+    Measurement(dt(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
+    Measurement(dt(2024, 1, 1, 11, 1), MeasType.HR, 36.5),
+    Measurement(dt(2024, 1, 1, 12, 1), MeasType.TEMP, 37.0),
+)
+
+# (name, input, sample_measurements keyword arguments, expected samples)
+_CASES = (
+    ("simple", _SIMPLE_INPUT, {}, (
+        Measurement(dt(2024, 1, 1, 10, 5), MeasType.TEMP, 36.5),
+        Measurement(dt(2024, 1, 1, 10, 5), MeasType.SPO2, 98.0),
+        Measurement(dt(2024, 1, 1, 10, 10), MeasType.TEMP, 37.0),
+        Measurement(dt(2024, 1, 1, 10, 10), MeasType.SPO2, 99.0),
+    )),
+    ("new_interval", _TEMP_SERIES_INPUT, {"interval": 10}, (
+        Measurement(dt(2024, 1, 1, 10, 10), MeasType.TEMP, 37.0),
+    )),
+    ("start_time", _TEMP_SERIES_INPUT, {"start_of_sampling": dt(2024, 1, 1, 10, 5)}, (
+        Measurement(dt(2024, 1, 1, 10, 10), MeasType.TEMP, 37.0),
+    )),
+    ("unsorted", _UNSORTED_INPUT, {"to_sort": False}, (
+        Measurement(dt(2024, 1, 1, 10, 5), MeasType.TEMP, 36.5),
+        Measurement(dt(2024, 1, 1, 10, 10), MeasType.TEMP, 37.0),
+    )),
+    ("single_measurement", _SINGLE_INPUT, {}, (
+        Measurement(dt(2024, 1, 1, 10, 5), MeasType.TEMP, 36.0),
+    )),
+    ("multiple_in_same_interval", _SAME_INTERVAL_INPUT, {}, (
+        Measurement(dt(2024, 1, 1, 10, 5), MeasType.TEMP, 37.0),
+    )),
+    ("exact_time", _EXACT_TIME_INPUT, {}, (
+        Measurement(dt(2024, 1, 1, 10, 10), MeasType.TEMP, 36.0),
+        Measurement(dt(2024, 1, 1, 10, 10), MeasType.SPO2, 36.5),
+    )),
+    ("large_time_gap", _LARGE_GAP_INPUT, {}, (
+        Measurement(dt(2024, 1, 1, 10, 5), MeasType.TEMP, 36.0),
+        Measurement(dt(2024, 1, 1, 11, 5), MeasType.TEMP, 36.5),
+    )),
+    ("multiple_types", _MULTIPLE_TYPES_INPUT, {}, (
+        Measurement(dt(2024, 1, 1, 10, 5), MeasType.TEMP, 36.0),
+        Measurement(dt(2024, 1, 1, 10, 5), MeasType.SPO2, 98.0),
+        Measurement(dt(2024, 1, 1, 10, 5), MeasType.HR, 70),
+        Measurement(dt(2024, 1, 1, 10, 10), MeasType.TEMP, 36.5),
+    )),
+    ("on_interval_boundaries", _ON_BOUNDARIES_INPUT, {}, (
+        Measurement(dt(2024, 1, 1, 10, 0), MeasType.TEMP, 36.0),
+        Measurement(dt(2024, 1, 1, 10, 5), MeasType.TEMP, 36.5),
+        Measurement(dt(2024, 1, 1, 10, 10), MeasType.HR, 37.0),
+    )),
+    ("rapid_succession", _RAPID_INPUT, {}, (
+        Measurement(dt(2024, 1, 1, 10, 5), MeasType.TEMP, 36.2),
+    )),
+    ("sparse", _SPARSE_INPUT, {}, (
+        Measurement(dt(2024, 1, 1, 10, 5), MeasType.TEMP, 36.0),
+        Measurement(dt(2024, 1, 1, 11, 5), MeasType.HR, 36.5),
+        Measurement(dt(2024, 1, 1, 12, 5), MeasType.TEMP, 37.0),
+    )),
+)
 
 class TestDataSampler(unittest.TestCase):
     """Unit tests for the DataSampler class."""
 
-    def setUp(self):
-        """Set up the test environment by initializing a DataSampler instance """
+    @classmethod
+    def setUpClass(cls):
+        """Set up the test environment by initializing a shared DataSampler instance """
 
-        self.sampler = DataSampler()
+        cls.sampler = DataSampler()
 
     def test_given_measurements_example(self):
         """Test sampling with provided example measurements"""
 
-        measurements = [
-            Measurement(datetime.strptime('2017-01-03T10:04:45',
-                                          '%Y-%m-%dT%H:%M:%S'), MeasType.TEMP, 35.79),
-            Measurement(datetime.strptime('2017-01-03T10:01:18',
-                                          '%Y-%m-%dT%H:%M:%S'), MeasType.SPO2, 98.78),
-            Measurement(datetime.strptime('2017-01-03T10:09:07',
-                                          '%Y-%m-%dT%H:%M:%S'), MeasType.TEMP, 35.01),
-            Measurement(datetime.strptime('2017-01-03T10:03:34',
-                                          '%Y-%m-%dT%H:%M:%S'), MeasType.SPO2, 96.49),
-            Measurement(datetime.strptime('2017-01-03T10:02:01',
-                                          '%Y-%m-%dT%H:%M:%S'), MeasType.TEMP, 35.82),
-            Measurement(datetime.strptime('2017-01-03T10:05:00',
-                                          '%Y-%m-%dT%H:%M:%S'), MeasType.SPO2, 97.17),
-            Measurement(datetime.strptime('2017-01-03T10:05:01', 
-                                          '%Y-%m-%dT%H:%M:%S'), MeasType.SPO2, 95.08),
-        ]
-
-        sampled = self.sampler.sample_measurements(measurements)
+        sampled = self.sampler.sample_measurements(_GIVEN_MEASUREMENTS)
 
-        DataSampler.print_data(sampled)
-
-        expected_output = [
-            Measurement(datetime.strptime('2017-01-03T10:05:00',
-                                          '%Y-%m-%dT%H:%M:%S'), MeasType.SPO2, 97.17),
-            Measurement(datetime.strptime('2017-01-03T10:05:00',
-                                          '%Y-%m-%dT%H:%M:%S'), MeasType.TEMP, 35.79),
-            Measurement(datetime.strptime('2017-01-03T10:10:00',
-                                          '%Y-%m-%dT%H:%M:%S'), MeasType.SPO2, 95.08),
-            Measurement(datetime.strptime('2017-01-03T10:10:00', 
-                                          '%Y-%m-%dT%H:%M:%S'), MeasType.TEMP, 35.01),
-        ]
-
-        self.assertEqual(len(sampled), len(expected_output))
-        for actual, expected in zip(sampled, expected_output):
-            self.assertEqual(actual.measurement_time, expected.measurement_time)
-            self.assertEqual(actual.measurement_type, expected.measurement_type)
-            self.assertEqual(actual.value, expected.value)
+        self.assertEqual(sampled, list(_GIVEN_SAMPLES))
 
     def test_init(self):
         """Test the inits of DataSampler and validation of interval"""
@@ -65,78 +194,35 @@ class TestDataSampler(unittest.TestCase):
         with self.assertRaises(ValueError):
             DataSampler(interval=None)
 
-    def test_sample_measurements(self):
-        """Test sampling of measurements with simple intervals"""
+    def test_sampling_cases(self):
+        """Test sampling of the shared input cases against their expected samples"""
 
-        measurements = [
-            Measurement(datetime(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
-            Measurement(datetime(2024, 1, 1, 10, 2), MeasType.SPO2, 98.0),
-            Measurement(datetime(2024, 1, 1, 10, 3), MeasType.TEMP, 36.5),
-            Measurement(datetime(2024, 1, 1, 10, 7), MeasType.TEMP, 37.0),
-            Measurement(datetime(2024, 1, 1, 10, 8), MeasType.SPO2, 99.0),
-        ]
-        sampled = self.sampler.sample_measurements(measurements)
-        self.assertEqual(len(sampled), 4)
-        self.assertEqual(sampled[0].measurement_time, datetime(2024, 1, 1, 10, 5))
-        self.assertEqual(sampled[0].measurement_type, MeasType.TEMP)
-        self.assertEqual(sampled[0].value, 36.5)
-        self.assertEqual(sampled[1].measurement_time, datetime(2024, 1, 1, 10, 5))
-        self.assertEqual(sampled[1].measurement_type, MeasType.SPO2)
-        self.assertEqual(sampled[1].value, 98.0)
+        for name, measurements, kwargs, expected in _CASES:
+            with self.subTest(case=name):
+                # Passing an interval changes the sampler's own, so use a separate instance.
+                sampler = DataSampler() if "interval" in kwargs else self.sampler
+                self.assertEqual(sampler.sample_measurements(measurements, **kwargs), list(expected))
 
-    def test_sample_measurements_with_new_interval(self):
-        """Test sampling of measurements with a specified news interval"""
+    def test_sample_measurements_with_assigned_interval(self):
+        """Test sampling after assigning a new interval to the sampler"""
 
-        measurements = [
-            Measurement(datetime(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
-            Measurement(datetime(2024, 1, 1, 10, 3), MeasType.TEMP, 36.5),
-            Measurement(datetime(2024, 1, 1, 10, 7), MeasType.TEMP, 37.0),
-        ]
-        sampled = self.sampler.sample_measurements(measurements, interval=10)
-        self.assertEqual(len(sampled), 1)
-        self.assertEqual(sampled[0].measurement_time, datetime(2024, 1, 1, 10, 10))
-        self.assertEqual(sampled[0].value, 37.0)
-
-    def test_sample_measurements_with_start_time(self):
-        """Test sampling of measurements with a specified start time"""
-
-        measurements = [
-            Measurement(datetime(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
-            Measurement(datetime(2024, 1, 1, 10, 3), MeasType.TEMP, 36.5),
-            Measurement(datetime(2024, 1, 1, 10, 7), MeasType.TEMP, 37.0),
-        ]
-        start_time = datetime(2024, 1, 1, 10, 5)
-        sampled = self.sampler.sample_measurements(measurements, start_of_sampling=start_time)
+        sampler = DataSampler()
+        sampler.interval = 10
+        sampled = sampler.sample_measurements(_TEMP_SERIES_INPUT)
         self.assertEqual(len(sampled), 1)
-        self.assertEqual(sampled[0].measurement_time, datetime(2024, 1, 1, 10, 10))
+        self.assertEqual(sampled[0].measurement_time, dt(2024, 1, 1, 10, 10))
         self.assertEqual(sampled[0].value, 37.0)
 
-    def test_sample_measurements_unsorted(self):
-        """Test sampling of unsorted measurements"""
-
-        measurements = [
-            Measurement(datetime(2024, 1, 1, 10, 7), MeasType.TEMP, 37.0),
-            Measurement(datetime(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
-            Measurement(datetime(2024, 1, 1, 10, 3), MeasType.TEMP, 36.5),
-        ]
-        sampled = self.sampler.sample_measurements(measurements, to_sort=False)
-        self.assertEqual(len(sampled), 2)
-        self.assertEqual(sampled[0].measurement_time, datetime(2024, 1, 1, 10, 5))
-        self.assertEqual(sampled[0].value, 36.5)
-        self.assertEqual(sampled[1].measurement_time, datetime(2024, 1, 1, 10, 10))
-        self.assertEqual(sampled[1].value, 37.0)
-
     def test_print_data_list(self):
         """Test printing of sampled data as a list"""
 
         measurements = [
-            Measurement(datetime(2024, 1, 1, 10, 5), MeasType.TEMP, 36.5),
-            Measurement(datetime(2024, 1, 1, 10, 10), MeasType.SPO2, 98.0),
+            Measurement(dt(2024, 1, 1, 10, 5), MeasType.TEMP, 36.5),
+            Measurement(dt(2024, 1, 1, 10, 10), MeasType.SPO2, 98.0),
         ]
         captured_output = io.StringIO()
-        sys.stdout = captured_output
-        DataSampler.print_data(measurements)
-        sys.stdout = sys.__stdout__
+        with redirect_stdout(captured_output):
+            DataSampler.print_data(measurements)
         expected_output = "{2024-01-01T10:05:00, TEMP, 36.50}\n{2024-01-01T10:10:00, SPO2, 98.00}\n"
         self.assertEqual(captured_output.getvalue(), expected_output)
 
@@ -145,17 +231,16 @@ class TestDataSampler(unittest.TestCase):
 
         measurements = {
             MeasType.TEMP: [
-                Measurement(datetime(2024, 1, 1, 10, 5), MeasType.TEMP, 36.5),
-                Measurement(datetime(2024, 1, 1, 10, 15), MeasType.TEMP, 36.7),
+                Measurement(dt(2024, 1, 1, 10, 5), MeasType.TEMP, 36.5),
+                Measurement(dt(2024, 1, 1, 10, 15), MeasType.TEMP, 36.7),
             ],
             MeasType.SPO2: [
-                Measurement(datetime(2024, 1, 1, 10, 10), MeasType.SPO2, 98.0),
+                Measurement(dt(2024, 1, 1, 10, 10), MeasType.SPO2, 98.0),
             ]
         }
         captured_output = io.StringIO()
-        sys.stdout = captured_output
-        DataSampler.print_data(measurements)
-        sys.stdout = sys.__stdout__
+        with redirect_stdout(captured_output):
+            DataSampler.print_data(measurements)
         expected_output = (
             "Measurement Type: TEMP\n"
             "  {2024-01-01T10:05:00, 36.50}\n"
@@ -165,160 +250,306 @@ class TestDataSampler(unittest.TestCase):
         )
         self.assertEqual(captured_output.getvalue(), expected_output)
 
+    def test_sample_measurements_does_not_modify_input(self):
+        """Test sampling leaves the given list of measurements unchanged"""
+
+        measurements = list(_UNSORTED_INPUT)
+        self.sampler.sample_measurements(measurements)
+        self.sampler.sample_measurements_by_type(measurements)
+        self.assertEqual(measurements, list(_UNSORTED_INPUT))
+
+    def test_sample_measurements_from_iterator(self):
+        """Test sampling accepts any iterable of measurements, including its own streamed output"""
+
+        expected = self.sampler.sample_measurements(_GIVEN_MEASUREMENTS)
+        self.assertEqual(self.sampler.sample_measurements(iter(_GIVEN_MEASUREMENTS)), expected)
+        self.assertEqual(self.sampler.sample_measurements(m for m in _GIVEN_MEASUREMENTS), expected)
+
+        streamed = self.sampler.sample_measurements_iter(_GIVEN_MEASUREMENTS)
+        self.assertEqual(self.sampler.sample_measurements(streamed), expected)
+
+    def test_sample_measurements_timezone_aware(self):
+        """Test aware measurement times are sampled and returned in their own timezone"""
+
+        utc_plus_2 = timezone(timedelta(hours=2))
+        measurements = [
+            Measurement(dt(2024, 1, 1, 10, 1).replace(tzinfo=utc_plus_2), MeasType.TEMP, 36.0),
+            Measurement(dt(2024, 1, 1, 8, 3).replace(tzinfo=timezone.utc), MeasType.TEMP, 36.5),
+            Measurement(dt(2024, 1, 1, 10, 7).replace(tzinfo=utc_plus_2), MeasType.TEMP, 37.0),
+        ]
+        expected = [
+            Measurement(dt(2024, 1, 1, 10, 5).replace(tzinfo=utc_plus_2), MeasType.TEMP, 36.5),
+            Measurement(dt(2024, 1, 1, 10, 10).replace(tzinfo=utc_plus_2), MeasType.TEMP, 37.0),
+        ]
+        sampled = self.sampler.sample_measurements(measurements)
+        self.assertEqual(sampled, expected)
+        self.assertEqual([m.measurement_time.utcoffset() for m in sampled], [timedelta(hours=2)] * 2)
+        self.assertEqual(self.sampler.sample_measurements_fused(measurements), expected)
+
+        start_time = dt(2024, 1, 1, 8, 5).replace(tzinfo=timezone.utc)
+        sampled = self.sampler.sample_measurements(measurements, start_of_sampling=start_time)
+        self.assertEqual(sampled, expected[1:])
+
+    def test_sample_measurements_mixed_naive_and_aware(self):
+        """Test mixing naive and aware times is rejected rather than shifted"""
+
+        naive = Measurement(dt(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0)
+        aware = Measurement(dt(2024, 1, 1, 10, 2).replace(tzinfo=timezone.utc), MeasType.TEMP, 36.5)
+        with self.assertRaises(TypeError):
+            self.sampler.sample_measurements([naive, aware])
+        with self.assertRaises(TypeError):
+            self.sampler.sample_measurements([naive], start_of_sampling=aware.measurement_time)
+        with self.assertRaises(TypeError):
+            self.sampler.sample_measurements([aware], start_of_sampling=naive.measurement_time)
+
+    def test_sample_measurements_past_datetime_max(self):
+        """Test a sample time past datetime.max raises instead of returning an int"""
+
+        measurements = [Measurement(dt(9999, 12, 31, 23, 58), MeasType.HR, 1)]
+        with self.assertRaises(OverflowError):
+            self.sampler.sample_measurements(measurements)
+        with self.assertRaises(OverflowError):
+            list(self.sampler.sample_measurements_iter(measurements))
+        with self.assertRaises(OverflowError):
+            self.sampler.sample_measurements_by_type(measurements)
+
+        # The last interval that still ends by datetime.max samples normally.
+        last = [Measurement(dt(9999, 12, 31, 23, 54), MeasType.HR, 1)]
+        self.assertEqual(self.sampler.sample_measurements(last),
+                         [Measurement(dt(9999, 12, 31, 23, 55), MeasType.HR, 1)])
+
     def test_sample_measurements_empty_input(self):
         """Test sampling of an empty list of measurements"""
 
         sampled = self.sampler.sample_measurements([])
         self.assertEqual(len(sampled), 0)
 
-    def test_sample_measurements_single_measurement(self):
-        """Test sampling of a single measurement."""
+    def test_sample_measurements_before_boundary_measurement(self):
+        """Test a measurement is still sampled when the next one lies on a later boundary"""
 
-        measurements = [Measurement(datetime(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0)]
-        sampled = self.sampler.sample_measurements(measurements)
-        self.assertEqual(len(sampled), 1)
-        self.assertEqual(sampled[0].measurement_time, datetime(2024, 1, 1, 10, 5))
-        self.assertEqual(sampled[0].value, 36.0)
+        sampled = self.sampler.sample_measurements(_BEFORE_BOUNDARY_INPUT)
+        self.assertEqual(sampled, [
+            Measurement(dt(2024, 1, 1, 10, 5), MeasType.TEMP, 36.0),
+            Measurement(dt(2024, 1, 1, 10, 10), MeasType.TEMP, 36.7),
+        ])
 
-    def test_sample_measurements_multiple_in_same_interval(self):
-        """Test sampling of multiple measurements in the same interval"""
+    def test_sample_measurements_boundary_time(self):
+        """Test sampling of measurements at boundary times and multiple types."""
 
-        measurements = [
-            Measurement(datetime(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
-            Measurement(datetime(2024, 1, 1, 10, 2), MeasType.TEMP, 36.5),
-            Measurement(datetime(2024, 1, 1, 10, 3), MeasType.TEMP, 37.0),
+        sampled = self.sampler.sample_measurements(_BOUNDARY_INPUT)
+
+        expected_output = [
+            Measurement(dt(2024, 1, 1, 10, 10), MeasType.TEMP, 36.1),
+            Measurement(dt(2024, 1, 1, 10, 10), MeasType.SPO2, 36.5),
+            Measurement(dt(2024, 1, 1, 10, 10), MeasType.HR, 36.5),
+            Measurement(dt(2024, 1, 1, 10, 15), MeasType.HR, 36.7),
+            Measurement(dt(2024, 1, 1, 10, 25), MeasType.HR, 30.5),
         ]
-        sampled = self.sampler.sample_measurements(measurements)
+
+        self.assertEqual(sampled, expected_output)
+
+        # Additional checks for specific boundary conditions
+        self.assertEqual(len([m for m in sampled
+                              if m.measurement_time == dt(2024, 1, 1, 10, 10)]), 3)
+        self.assertTrue(any(m.measurement_type == MeasType.TEMP and
+                            m.measurement_time == dt(2024, 1, 1, 10, 10) for m in sampled))
+        self.assertTrue(any(m.measurement_type == MeasType.SPO2 and
+                            m.measurement_time == dt(2024, 1, 1, 10, 10) for m in sampled))
+        self.assertTrue(any(m.measurement_type == MeasType.HR and
+                            m.measurement_time == dt(2024, 1, 1, 10, 10) for m in sampled))
+
+    def test_sample_measurements_ignores_microseconds(self):
+        """Test the microsecond of measurement times is ignored when sampling"""
+
+        sampled = self.sampler.sample_measurements(_MICROSECOND_INPUT)
         self.assertEqual(len(sampled), 1)
-        self.assertEqual(sampled[0].measurement_time, datetime(2024, 1, 1, 10, 5))
-        self.assertEqual(sampled[0].value, 37.0)
+        self.assertEqual(sampled[0].measurement_time, dt(2024, 1, 1, 10, 10))
+        self.assertEqual(sampled[0].value, 36.5)
 
-    def test_sample_measurements_exact_time(self):
-        """Test sampling of measurements that fall exactly on interval boundaries"""
+    @unittest.skipUnless(_kernels.HAS_KERNEL, "no compiled kernel available")
+    def test_compiled_kernel_matches_numpy(self):
+        """Test the compiled kernel and the NumPy fallback produce the same samples"""
 
         measurements = [
-            Measurement(datetime(2024, 1, 1, 10, 10), MeasType.TEMP, 36.0),
-            Measurement(datetime(2024, 1, 1, 10, 10), MeasType.SPO2, 36.5),
+            Measurement(dt(2024, 1, 1, 10, 2), MeasType.TEMP, 36.0),
+            Measurement(dt(2024, 1, 1, 10, 4), MeasType.TEMP, 36.2),
+            Measurement(dt(2024, 1, 1, 10, 10), MeasType.TEMP, 36.1),
+            Measurement(dt(2024, 1, 1, 10, 10), MeasType.SPO2, 36.5),
+            Measurement(dt(2024, 1, 1, 10, 12, 30), MeasType.SPO2, 97.0),
+            Measurement(dt(2024, 1, 1, 11, 31), MeasType.TEMP, 36.7),
+            Measurement(dt(2024, 1, 1, 11, 33), MeasType.HR, 30.5),
         ]
-        sampled = self.sampler.sample_measurements(measurements)
-        self.assertEqual(len(sampled), 2)
-        self.assertEqual(sampled[0].measurement_time, datetime(2024, 1, 1, 10, 10))
-        self.assertEqual(sampled[0].value, 36.0)
-        self.assertEqual(sampled[1].measurement_time, datetime(2024, 1, 1, 10, 10))
-        self.assertEqual(sampled[1].value, 36.5)
+        start_time = dt(2024, 1, 1, 10, 3)
 
-    def test_sample_measurements_boundary_time(self):
-        """Test sampling of measurements at boundary times and multiple types."""
+        compiled = self.sampler.sample_measurements(measurements, start_of_sampling=start_time)
+        with mock.patch.object(_kernels, "HAS_KERNEL", False):
+            fallback = self.sampler.sample_measurements(measurements, start_of_sampling=start_time)
+
+        self.assertEqual(compiled, fallback)
+
+    def test_sample_measurements_without_threads(self):
+        """Test the thread pool is only used when enabled for enough rows, with the same result"""
 
         measurements = [
-            Measurement(datetime(2024, 1, 1, 10, 7), MeasType.TEMP, 36.0),
-            Measurement(datetime(2024, 1, 1, 10, 10), MeasType.TEMP, 36.1),
-            Measurement(datetime(2024, 1, 1, 10, 10), MeasType.SPO2, 36.5),
-            Measurement(datetime(2024, 1, 1, 10, 10), MeasType.HR, 36.5),
-            Measurement(datetime(2024, 1, 1, 10, 15), MeasType.HR, 36.7),
-            Measurement(datetime(2024, 1, 1, 10, 25), MeasType.HR, 30.5),
+            Measurement(dt(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
+            Measurement(dt(2024, 1, 1, 10, 2), MeasType.SPO2, 98.0),
+            Measurement(dt(2024, 1, 1, 10, 3), MeasType.HR, 70),
+            Measurement(dt(2024, 1, 1, 10, 7), MeasType.TEMP, 36.5),
         ]
+        with mock.patch("datasampler.sampler.ThreadPoolExecutor", wraps=ThreadPoolExecutor) as pool:
+            sequential = self.sampler.sample_measurements(measurements)
+            with mock.patch.object(DataSampler, "USE_THREADS", True):
+                self.sampler.sample_measurements(measurements)
+            pool.assert_not_called()
 
-        sampled = self.sampler.sample_measurements(measurements)
+            with mock.patch.object(DataSampler, "USE_THREADS", True), \
+                    mock.patch.object(DataSampler, "THREAD_MIN_ROWS", 0):
+                threaded = self.sampler.sample_measurements(measurements)
+            pool.assert_called_once()
+        self.assertEqual(threaded, sequential)
 
-        DataSampler.print_data(sampled)
+    def test_sample_measurements_assume_sorted(self):
+        """Test sampling time-ordered input with the sortedness check skipped"""
 
-        expected_output = [
-            Measurement(datetime(2024, 1, 1, 10, 10), MeasType.TEMP, 36.1),
-            Measurement(datetime(2024, 1, 1, 10, 10), MeasType.SPO2, 36.5),
-            Measurement(datetime(2024, 1, 1, 10, 10), MeasType.HR, 36.5),
-            Measurement(datetime(2024, 1, 1, 10, 15), MeasType.HR, 36.7),
-            Measurement(datetime(2024, 1, 1, 10, 25), MeasType.HR, 30.5),
+        measurements = [
+            Measurement(dt(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
+            Measurement(dt(2024, 1, 1, 10, 2), MeasType.SPO2, 98.0),
+            Measurement(dt(2024, 1, 1, 10, 6), MeasType.TEMP, 36.5),
+            Measurement(dt(2024, 1, 1, 10, 7), MeasType.SPO2, 97.0),
         ]
+        start_time = dt(2024, 1, 1, 10, 2)
+        expected = self.sampler.sample_measurements(measurements, start_of_sampling=start_time)
+        trusting_sampler = DataSampler(assume_sorted=True)
+        sampled = trusting_sampler.sample_measurements(measurements, start_of_sampling=start_time)
+        self.assertEqual(sampled, expected)
 
-        self.assertEqual(len(sampled), len(expected_output))
-        for actual, expected in zip(sampled, expected_output):
-            self.assertEqual(actual.measurement_time, expected.measurement_time)
-            self.assertEqual(actual.measurement_type, expected.measurement_type)
-            self.assertEqual(actual.value, expected.value)
+    def test_sample_measurements_fused(self):
+        """Test the single-pass sampler matches sample_measurements"""
 
-        # Additional checks for specific boundary conditions
-        self.assertEqual(len([m for m in sampled
-                              if m.measurement_time == datetime(2024, 1, 1, 10, 10)]), 3)
-        self.assertTrue(any(m.measurement_type == MeasType.TEMP and
-                            m.measurement_time == datetime(2024, 1, 1, 10, 10) for m in sampled))
-        self.assertTrue(any(m.measurement_type == MeasType.SPO2 and
-                            m.measurement_time == datetime(2024, 1, 1, 10, 10) for m in sampled))
-        self.assertTrue(any(m.measurement_type == MeasType.HR and
-                            m.measurement_time == datetime(2024, 1, 1, 10, 10) for m in sampled))
+        measurements = [
+            Measurement(dt(2024, 1, 1, 10, 7), MeasType.HR, 72),
+            Measurement(dt(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
+            Measurement(dt(2024, 1, 1, 10, 2), MeasType.SPO2, 98.0),
+            Measurement(dt(2024, 1, 1, 10, 4), MeasType.TEMP, 36.2),
+            Measurement(dt(2024, 1, 1, 10, 9), MeasType.SPO2, 97.0),
+            Measurement(dt(2024, 1, 1, 10, 3), MeasType.HR, 70),
+        ]
+        expected = self.sampler.sample_measurements(measurements)
+        self.assertEqual(self.sampler.sample_measurements_fused(measurements), expected)
+        self.assertEqual(self.sampler.sample_measurements_fused([]), [])
 
-    def test_sample_measurements_large_time_gap(self):
-        """Test sampling of measurements with a large time gap between them."""
+    @unittest.skipUnless(_kernels.HAS_KERNEL, "no compiled kernel available")
+    def test_fused_kernel_matches_fallback(self):
+        """Test the fused kernel and its grouped NumPy fallback produce the same samples"""
 
         measurements = [
-            Measurement(datetime(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
-            Measurement(datetime(2024, 1, 1, 11, 1), MeasType.TEMP, 36.5),
+            Measurement(dt(2024, 1, 1, 10, 7), MeasType.HR, 72),
+            Measurement(dt(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
+            Measurement(dt(2024, 1, 1, 10, 2), MeasType.SPO2, 98.0),
+            Measurement(dt(2024, 1, 1, 10, 10), MeasType.TEMP, 36.2),
+            Measurement(dt(2024, 1, 1, 10, 12, 30), MeasType.SPO2, 97.0),
+            Measurement(dt(2024, 1, 1, 10, 3), MeasType.HR, 70),
         ]
-        sampled = self.sampler.sample_measurements(measurements)
-        DataSampler.print_data(sampled)
-        self.assertEqual(len(sampled), 2)
-        self.assertEqual(sampled[0].measurement_time, datetime(2024, 1, 1, 10, 5))
-        self.assertEqual(sampled[1].measurement_time, datetime(2024, 1, 1, 11, 5))
+        fused = self.sampler.sample_measurements_fused(measurements)
+        with mock.patch.object(_kernels, "HAS_KERNEL", False):
+            fallback = self.sampler.sample_measurements_fused(measurements)
+        self.assertEqual(fused, fallback)
+
+    def test_sample_measurements_grouped_input(self):
+        """Test sampling input whose types already arrive in contiguous runs"""
 
-    def test_sample_measurements_multiple_types(self):
-        """Test sampling of measurements with multiple type"""
         measurements = [
-            Measurement(datetime(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
-            Measurement(datetime(2024, 1, 1, 10, 2), MeasType.SPO2, 98.0),
-            Measurement(datetime(2024, 1, 1, 10, 3), MeasType.HR, 70),
-            Measurement(datetime(2024, 1, 1, 10, 7), MeasType.TEMP, 36.5),
+            Measurement(dt(2024, 1, 1, 10, 1), MeasType.SPO2, 98.0),
+            Measurement(dt(2024, 1, 1, 10, 6), MeasType.SPO2, 97.0),
+            Measurement(dt(2024, 1, 1, 10, 7), MeasType.TEMP, 36.0),
+            Measurement(dt(2024, 1, 1, 10, 12), MeasType.TEMP, 36.5),
         ]
-        sampled = self.sampler.sample_measurements(measurements)
-        self.assertEqual(len(sampled), 4)
-        self.assertEqual(set(m.measurement_type for m in sampled),
-                         {MeasType.TEMP, MeasType.SPO2, MeasType.HR})
+        grouped = self.sampler.sample_measurements_by_type(measurements)
+        self.assertEqual(list(grouped), [MeasType.SPO2, MeasType.TEMP])
+        self.assertEqual(grouped[MeasType.SPO2], [
+            Measurement(dt(2024, 1, 1, 10, 5), MeasType.SPO2, 98.0),
+            Measurement(dt(2024, 1, 1, 10, 10), MeasType.SPO2, 97.0),
+        ])
+        self.assertEqual(grouped[MeasType.TEMP], [
+            Measurement(dt(2024, 1, 1, 10, 10), MeasType.TEMP, 36.0),
+            Measurement(dt(2024, 1, 1, 10, 15), MeasType.TEMP, 36.5),
+        ])
+
+    def test_sample_measurements_grouped_input_any_type_order(self):
+        """Test contiguous type runs are sliced in place whatever the order of the types"""
 
-    def test_measurements_on_interval_boundaries(self):
-        """Test sampling of measurements exactly on interval boundaries"""
         measurements = [
-            Measurement(datetime(2024, 1, 1, 10, 0), MeasType.TEMP, 36.0),
-            Measurement(datetime(2024, 1, 1, 10, 5), MeasType.TEMP, 36.5),
-            Measurement(datetime(2024, 1, 1, 10, 10), MeasType.HR, 37.0),
+            Measurement(dt(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
+            Measurement(dt(2024, 1, 1, 10, 6), MeasType.TEMP, 36.5),
+            Measurement(dt(2024, 1, 1, 10, 7), MeasType.HR, 70),
+            Measurement(dt(2024, 1, 1, 10, 8), MeasType.SPO2, 98.0),
+            Measurement(dt(2024, 1, 1, 10, 12), MeasType.SPO2, 97.0),
         ]
-        sampled = self.sampler.sample_measurements(measurements)
-        self.assertEqual(len(sampled), 3)
-        self.assertEqual(sampled[0].measurement_time, datetime(2024, 1, 1, 10, 0))
-        self.assertEqual(sampled[1].measurement_time, datetime(2024, 1, 1, 10, 5))
-        self.assertEqual(sampled[2].measurement_time, datetime(2024, 1, 1, 10, 10))
+        with mock.patch("datasampler.sampler.np.argsort", wraps=np.argsort) as argsort:
+            grouped = self.sampler.sample_measurements_by_type(measurements)
+        argsort.assert_not_called()
+        self.assertEqual(grouped, {
+            MeasType.TEMP: [
+                Measurement(dt(2024, 1, 1, 10, 5), MeasType.TEMP, 36.0),
+                Measurement(dt(2024, 1, 1, 10, 10), MeasType.TEMP, 36.5),
+            ],
+            MeasType.HR: [
+                Measurement(dt(2024, 1, 1, 10, 10), MeasType.HR, 70),
+            ],
+            MeasType.SPO2: [
+                Measurement(dt(2024, 1, 1, 10, 10), MeasType.SPO2, 98.0),
+                Measurement(dt(2024, 1, 1, 10, 15), MeasType.SPO2, 97.0),
+            ],
+        })
+        self.assertEqual(list(grouped), [MeasType.TEMP, MeasType.HR, MeasType.SPO2])
 
-    def test_rapid_succession_measurements(self):
-        """Test sampling of measurements in rapid succession"""
+    def test_sample_measurements_iter(self):
+        """Test the streaming sampler yields the same samples and can be printed"""
 
         measurements = [
-            Measurement(datetime(2024, 1, 1, 10, 1, 1), MeasType.TEMP, 36.0),
-            Measurement(datetime(2024, 1, 1, 10, 1, 2), MeasType.TEMP, 36.1),
-            Measurement(datetime(2024, 1, 1, 10, 1, 3), MeasType.TEMP, 36.2),
+            Measurement(dt(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
+            Measurement(dt(2024, 1, 1, 10, 2), MeasType.SPO2, 98.0),
+            Measurement(dt(2024, 1, 1, 10, 7), MeasType.TEMP, 36.5),
         ]
-        sampled = self.sampler.sample_measurements(measurements)
-        self.assertEqual(len(sampled), 1)
-        self.assertEqual(sampled[0].measurement_time, datetime(2024, 1, 1, 10, 5))
-        self.assertEqual(sampled[0].value, 36.2)
+        expected = self.sampler.sample_measurements(measurements)
+        self.assertEqual(list(self.sampler.sample_measurements_iter(measurements)), expected)
+
+        captured_output = io.StringIO()
+        with redirect_stdout(captured_output):
+            DataSampler.print_data(self.sampler.sample_measurements_iter(measurements))
+        expected_output = ("{2024-01-01T10:05:00, TEMP, 36.00}\n"
+                           "{2024-01-01T10:05:00, SPO2, 98.00}\n"
+                           "{2024-01-01T10:10:00, TEMP, 36.50}\n")
+        self.assertEqual(captured_output.getvalue(), expected_output)
 
-    def test_sparse_measurements(self):
-        """Test sampling of sparse measurements"""
+    def test_sample_measurements_iter_streams_in_chunks(self):
+        """Test the streaming sampler and print_data work through the samples chunk by chunk"""
 
         measurements = [
-            Measurement(datetime(2024, 1, 1, 10, 1), MeasType.TEMP, 36.0),
-            Measurement(datetime(2024, 1, 1, 11, 1), MeasType.HR, 36.5),
-            Measurement(datetime(2024, 1, 1, 12, 1), MeasType.TEMP, 37.0),
+            Measurement(dt(2024, 1, 1, 10, minute), meas_type, float(minute))
+            for minute in range(1, 26, 4)
+            for meas_type in (MeasType.SPO2, MeasType.TEMP)
         ]
-        sampled = self.sampler.sample_measurements(measurements)
-        self.assertEqual(len(sampled), 3)
-        self.assertEqual(sampled[0].measurement_time, datetime(2024, 1, 1, 10, 5))
-        self.assertEqual(sampled[1].measurement_time, datetime(2024, 1, 1, 11, 5))
-        self.assertEqual(sampled[2].measurement_time, datetime(2024, 1, 1, 12, 5))
+        expected = self.sampler.sample_measurements(measurements)
+        expected_output = "".join(
+            f"{{{m.measurement_time.isoformat()}, {m.measurement_type.name}, {m.value:.2f}}}\n"
+            for m in expected)
+
+        with mock.patch("datasampler.sampler._ITER_CHUNK", 4):
+            self.assertEqual(list(self.sampler.sample_measurements_iter(measurements)), expected)
+
+            captured_output = io.StringIO()
+            with redirect_stdout(captured_output), \
+                    mock.patch.object(captured_output, "write", wraps=captured_output.write) as write:
+                DataSampler.print_data(self.sampler.sample_measurements_iter(measurements))
+        self.assertEqual(captured_output.getvalue(), expected_output)
+        self.assertEqual(write.call_count, -(-len(expected) // 4))
 
     def test_print_data_empty(self):
         """Test printing of an empty list of measurements"""
         captured_output = io.StringIO()
-        sys.stdout = captured_output
-        DataSampler.print_data([])
-        sys.stdout = sys.__stdout__
+        with redirect_stdout(captured_output):
+            DataSampler.print_data([])
         self.assertEqual(captured_output.getvalue(), "")
 
     def test_print_data_invalid_input(self):